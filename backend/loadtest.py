@@ -0,0 +1,188 @@
+"""
+Load-test harness for the AI-CVD Risk Assessment API
+
+Drives synthetic PatientData traffic against a running instance and reports
+RPS and p50/p95/p99 latency of successful requests, plus attempted RPS and
+error rate, at increasing concurrency. Failed requests are timed separately
+(err ms).
+
+Usage:
+    python serve.py --workers 4            # in one terminal
+    python loadtest.py --concurrency 1,8,32,128 --duration 15
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+import httpx
+
+
+ENDPOINTS = ["/predict", "/assess", "/assess_batch"]
+
+
+# ---------------- SYNTHETIC DATA ----------------
+def random_patient(rng: random.Random) -> dict:
+    """One PatientData payload with values in realistic clinical ranges"""
+    return {
+        "age": rng.randint(29, 77),
+        "sex": rng.randint(0, 1),
+        "cp": rng.randint(0, 3),
+        "trestbps": rng.randint(94, 200),
+        "chol": rng.randint(126, 564),
+        "fbs": rng.randint(0, 1),
+        "restecg": rng.randint(0, 2),
+        "thalach": rng.randint(71, 202),
+        "exang": rng.randint(0, 1),
+        "oldpeak": round(rng.uniform(0.0, 6.2), 1),
+        "slope": rng.randint(0, 2),
+        "ca": rng.randint(0, 4),
+        "thal": rng.randint(0, 3),
+    }
+
+
+def build_payload(endpoint: str, rng: random.Random, batch_size: int):
+    if endpoint == "/assess_batch":
+        return [random_patient(rng) for _ in range(batch_size)]
+    return random_patient(rng)
+
+
+# ---------------- LOAD GENERATION ----------------
+async def user_loop(client, endpoint, deadline, batch_size, rng, latencies, failures, errors):
+    """A single virtual user sending requests back-to-back until the deadline"""
+    while time.perf_counter() < deadline:
+        payload = build_payload(endpoint, rng, batch_size)
+        start = time.perf_counter()
+        try:
+            response = await client.post(endpoint, json=payload)
+            ok = response.status_code < 400
+            reason = str(response.status_code)
+        except httpx.HTTPError as exc:
+            ok = False
+            reason = type(exc).__name__
+        elapsed = time.perf_counter() - start
+        # Timeouts and fast error responses would skew the success percentiles
+        if ok:
+            latencies.append(elapsed)
+        else:
+            failures.append(elapsed)
+            errors[reason] = errors.get(reason, 0) + 1
+
+
+def percentile(sorted_values, pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(int(round(pct / 100 * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+async def run_stage(base_url, endpoint, concurrency, duration, warmup, batch_size, timeout):
+    """Run one endpoint at a fixed concurrency and return its summary"""
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    rngs = [random.Random(seed) for seed in range(concurrency)]
+
+    async def run_users(seconds, latencies, failures, errors):
+        deadline = time.perf_counter() + seconds
+        await asyncio.gather(*[
+            user_loop(client, endpoint, deadline, batch_size, rng, latencies, failures, errors)
+            for rng in rngs
+        ])
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=timeout) as client:
+        # Warm-up opens the keep-alive connections; its timings are discarded
+        if warmup > 0:
+            await run_users(warmup, [], [], {})
+
+        latencies = []
+        failures = []
+        errors = {}
+        started = time.perf_counter()
+        await run_users(duration, latencies, failures, errors)
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    total = len(latencies) + len(failures)
+    return {
+        "endpoint": endpoint,
+        "concurrency": concurrency,
+        "requests": total,
+        # Fast 413/503/500 responses must not count as throughput
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        "attempted_rps": total / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "error_rate": len(failures) / total if total else 0.0,
+        "error_mean_ms": sum(failures) / len(failures) * 1000 if failures else 0.0,
+        "errors": errors,
+    }
+
+
+# ---------------- REPORTING ----------------
+def print_header():
+    print(f"{'endpoint':<14} {'conc':>5} {'reqs':>8} {'rps':>9} {'att rps':>9} "
+          f"{'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'err %':>7} {'err ms':>9}  errors")
+
+
+def print_row(result):
+    errors = ", ".join(f"{k}x{v}" for k, v in sorted(result["errors"].items())) or "-"
+    print(f"{result['endpoint']:<14} {result['concurrency']:>5} {result['requests']:>8} "
+          f"{result['rps']:>9.1f} {result['attempted_rps']:>9.1f} {result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} "
+          f"{result['p99_ms']:>9.2f} {result['error_rate'] * 100:>6.2f}% "
+          f"{result['error_mean_ms']:>9.2f}  {errors}")
+
+
+async def main_async(args):
+    # Fail fast if nothing is listening
+    async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout) as client:
+        (await client.get("/health")).raise_for_status()
+
+    results = []
+    print_header()
+    for endpoint in args.endpoints:
+        for concurrency in args.concurrency:
+            result = await run_stage(
+                args.url, endpoint, concurrency, args.duration, args.warmup,
+                args.batch_size, args.timeout
+            )
+            print_row(result)
+            results.append(result)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load-test the AI-CVD Risk Assessment API")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS),
+                        help="Comma-separated endpoints to exercise")
+    parser.add_argument("--concurrency", default="1,4,16,64",
+                        help="Comma-separated concurrency levels, run in order")
+    parser.add_argument("--duration", type=float, default=10.0,
+                        help="Measured seconds per endpoint/concurrency stage")
+    parser.add_argument("--warmup", type=float, default=2.0,
+                        help="Unmeasured seconds before each stage to open connections")
+    parser.add_argument("--batch-size", type=int, default=10,
+                        help="Patients per /assess_batch request")
+    parser.add_argument("--timeout", type=float, default=30.0,
+                        help="Per-request timeout in seconds")
+    parser.add_argument("--output", help="Optional JSON file for the raw results")
+    args = parser.parse_args(argv)
+
+    args.endpoints = [e.strip() for e in args.endpoints.split(",") if e.strip()]
+    try:
+        args.concurrency = [int(c) for c in args.concurrency.split(",") if c.strip()]
+    except ValueError:
+        parser.error("--concurrency levels must be positive integers")
+    if not args.concurrency or any(c <= 0 for c in args.concurrency):
+        parser.error("--concurrency levels must be positive integers")
+    return args
+
+
+if __name__ == "__main__":
+    asyncio.run(main_async(parse_args()))
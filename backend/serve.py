@@ -0,0 +1,180 @@
+"""
+Production serving entry point for the AI-CVD Risk Assessment API
+
+Usage:
+    python serve.py --workers 4 --port 8000
+
+Every option can also be set through an environment variable (see --help),
+so the same command works locally and inside a container.
+"""
+
+import argparse
+import os
+
+import uvicorn
+
+
+# ---------------- REQUEST SIZE LIMITS ----------------
+class RequestSizeLimitMiddleware:
+    """
+    Reject oversized requests before they reach the API
+    Headers over max_header_size get 431, bodies over max_body_size get 413
+    uvicorn enforces neither under httptools, so both are checked here
+    """
+
+    def __init__(self, app, max_body_size: int, max_header_size: int):
+        self.app = app
+        self.max_body_size = max_body_size
+        self.max_header_size = max_header_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        header_size = 0
+        content_length = None
+        for name, value in scope["headers"]:
+            header_size += len(name) + len(value)
+            if name == b"content-length":
+                content_length = value
+
+        if header_size > self.max_header_size:
+            await self._reject(send, 431, "Request headers too large")
+            return
+
+        # Fast path: the client declared the size up front
+        if content_length is not None:
+            try:
+                declared = int(content_length)
+            except ValueError:
+                declared = -1
+            if declared < 0:
+                await self._reject(send, 400, "Invalid Content-Length header")
+                return
+            if declared > self.max_body_size:
+                await self._reject(send, 413, "Request body too large")
+                return
+
+        # Chunked uploads have no content-length, so buffer the body up to the
+        # limit and only hand it to the app once it is known to fit
+        messages = []
+        received = 0
+        while True:
+            message = await receive()
+            messages.append(message)
+            if message["type"] != "http.request":
+                break
+            received += len(message.get("body", b""))
+            if received > self.max_body_size:
+                await self._reject(send, 413, "Request body too large")
+                return
+            if not message.get("more_body", False):
+                break
+
+        async def replay_receive():
+            if messages:
+                return messages.pop(0)
+            return await receive()
+
+        await self.app(scope, replay_receive, send)
+
+    async def _reject(self, send, status: int, detail: str):
+        body = ('{"detail":"%s"}' % detail).encode()
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"connection", b"close"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+def create_app():
+    """
+    Build the served app inside each worker
+    Run with factory=True so the supervisor process never imports main.py
+    """
+    from starlette.middleware import Middleware
+    from main import app
+
+    # Same guard as add_middleware(): user_middleware is only read when the
+    # stack is first built, so changes after that would be silently ignored
+    if app.middleware_stack is not None:
+        raise RuntimeError("Cannot add middleware after an application has started")
+
+    # add_middleware() would put this outside CORSMiddleware; appending keeps it
+    # inside, so 413/431 responses still carry the CORS headers the web client needs.
+    # Drop any earlier entry so calling the factory twice does not stack limiters
+    app.user_middleware[:] = [
+        m for m in app.user_middleware if m.cls is not RequestSizeLimitMiddleware
+    ]
+    app.user_middleware.append(Middleware(
+        RequestSizeLimitMiddleware,
+        max_body_size=int(os.getenv("CVD_MAX_BODY_SIZE", 1024 * 1024)),
+        max_header_size=int(os.getenv("CVD_MAX_HEADER_SIZE", 16 * 1024)),
+    ))
+    return app
+
+
+# ---------------- CLI ----------------
+def available_cpus() -> int:
+    """CPUs this process may run on, honouring affinity masks (e.g. docker --cpuset-cpus)"""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Serve the AI-CVD Risk Assessment API")
+    parser.add_argument("--host", default=os.getenv("CVD_HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("CVD_PORT", 8000)))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("CVD_WORKERS", available_cpus())),
+                        help="Worker processes (env CVD_WORKERS, default: CPUs this process may use)")
+    parser.add_argument("--loop", default=os.getenv("CVD_LOOP", "auto"),
+                        choices=["auto", "asyncio", "uvloop"],
+                        help="Event loop (env CVD_LOOP, auto prefers uvloop when installed)")
+    parser.add_argument("--http", default=os.getenv("CVD_HTTP", "auto"),
+                        choices=["auto", "h11", "httptools"],
+                        help="HTTP parser (env CVD_HTTP, auto prefers httptools when installed)")
+    parser.add_argument("--keep-alive", type=int, default=int(os.getenv("CVD_KEEP_ALIVE", 5)),
+                        help="Seconds to hold idle keep-alive connections open (env CVD_KEEP_ALIVE)")
+    parser.add_argument("--backlog", type=int, default=int(os.getenv("CVD_BACKLOG", 2048)))
+    parser.add_argument("--limit-concurrency", type=int, default=os.getenv("CVD_LIMIT_CONCURRENCY"),
+                        help="Max concurrent connections per worker before 503 (env CVD_LIMIT_CONCURRENCY)")
+    parser.add_argument("--max-header-size", type=int, default=int(os.getenv("CVD_MAX_HEADER_SIZE", 16 * 1024)),
+                        help="Max total header bytes before 431 (env CVD_MAX_HEADER_SIZE)")
+    parser.add_argument("--max-body-size", type=int, default=int(os.getenv("CVD_MAX_BODY_SIZE", 1024 * 1024)),
+                        help="Max request body bytes before 413 (env CVD_MAX_BODY_SIZE)")
+    parser.add_argument("--access-log", action="store_true",
+                        default=os.getenv("CVD_ACCESS_LOG", "0") == "1")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    # Workers build the app themselves, so pass the limits through the environment
+    os.environ["CVD_MAX_BODY_SIZE"] = str(args.max_body_size)
+    os.environ["CVD_MAX_HEADER_SIZE"] = str(args.max_header_size)
+
+    uvicorn.run(
+        "serve:create_app",
+        factory=True,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        loop=args.loop,
+        http=args.http,
+        timeout_keep_alive=args.keep_alive,
+        backlog=args.backlog,
+        limit_concurrency=args.limit_concurrency,
+        access_log=args.access_log,
+    )
+
+
+if __name__ == "__main__":
+    main()
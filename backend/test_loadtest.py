@@ -0,0 +1,30 @@
+import pytest
+
+from loadtest import parse_args, percentile
+
+
+def test_percentile_empty():
+    assert percentile([], 50) == 0.0
+
+
+def test_percentile_single_value():
+    assert percentile([0.2], 50) == 0.2
+    assert percentile([0.2], 99) == 0.2
+
+
+def test_percentile_p99_index():
+    values = [i / 1000 for i in range(1, 101)]
+    assert percentile(values, 50) == pytest.approx(0.050, abs=0.001)
+    assert percentile(values, 99) == 0.099
+    assert percentile(values, 100) == 0.100
+
+
+def test_concurrency_keeps_given_order():
+    assert parse_args(["--concurrency", "16, 1,4"]).concurrency == [16, 1, 4]
+
+
+@pytest.mark.parametrize("value", ["1,x", "0", "4,-1", ","])
+def test_concurrency_rejects_invalid(value):
+    with pytest.raises(SystemExit) as exc:
+        parse_args(["--concurrency", value])
+    assert exc.value.code == 2
@@ -0,0 +1,104 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.testclient import TestClient
+from starlette.middleware import Middleware
+
+from serve import RequestSizeLimitMiddleware, create_app
+
+
+def make_client(max_body_size=100, max_header_size=4096):
+    app = FastAPI()
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    app.user_middleware.append(Middleware(
+        RequestSizeLimitMiddleware,
+        max_body_size=max_body_size,
+        max_header_size=max_header_size,
+    ))
+
+    @app.post("/echo")
+    def echo(payload: dict):
+        return payload
+
+    return TestClient(app)
+
+
+def test_small_body_passes():
+    response = make_client().post("/echo", json={"age": 50})
+    assert response.status_code == 200
+    assert response.json() == {"age": 50}
+
+
+def test_chunked_body_passes_when_under_limit():
+    def chunks():
+        yield b'{"age":'
+        yield b' 50}'
+
+    response = make_client().post(
+        "/echo", content=chunks(), headers={"content-type": "application/json"}
+    )
+    assert response.status_code == 200
+    assert response.json() == {"age": 50}
+
+
+def test_declared_body_too_large():
+    response = make_client().post("/echo", json={"notes": "x" * 200})
+    assert response.status_code == 413
+
+
+def test_chunked_body_too_large():
+    def chunks():
+        for _ in range(10):
+            yield b"x" * 50
+
+    response = make_client().post(
+        "/echo", content=chunks(), headers={"content-type": "application/json"}
+    )
+    assert "content-length" not in response.request.headers
+    assert response.status_code == 413
+
+
+def test_invalid_content_length():
+    client = make_client()
+    for value in ["abc", "-1"]:
+        response = client.post(
+            "/echo", content=b"{}",
+            headers={"content-type": "application/json", "content-length": value},
+        )
+        assert response.status_code == 400
+
+
+def test_headers_too_large():
+    response = make_client().post(
+        "/echo", json={}, headers={"x-padding": "x" * 5000}
+    )
+    assert response.status_code == 431
+
+
+def test_rejection_keeps_cors_headers():
+    response = make_client().post(
+        "/echo", json={"notes": "x" * 200}, headers={"origin": "http://localhost:5000"}
+    )
+    assert response.status_code == 413
+    assert response.headers["access-control-allow-origin"] == "*"
+
+
+def test_create_app_applies_limits_inside_cors(monkeypatch):
+    pytest.importorskip("shap")
+    monkeypatch.setenv("CVD_MAX_BODY_SIZE", "100")
+    app = create_app()
+    # A second call must not stack a second limiter
+    assert create_app() is app
+    assert sum(m.cls is RequestSizeLimitMiddleware for m in app.user_middleware) == 1
+
+    response = TestClient(app).post(
+        "/predict", json={"notes": "x" * 200}, headers={"origin": "http://localhost:5000"}
+    )
+    assert response.status_code == 413
+    # main.py allows credentials, so CORS echoes the origin instead of "*"
+    assert response.headers["access-control-allow-origin"] == "http://localhost:5000"